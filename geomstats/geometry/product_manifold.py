@@ -3,6 +3,8 @@
 Lead author: Nicolas Guigui.
 """
 
+import os
+
 import joblib
 
 import geomstats.backend as gs
@@ -13,6 +15,30 @@ from geomstats.geometry.product_riemannian_metric import (
     ProductRiemannianMetric,
 )
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def _copy_block(flat, start, out):
+        """Copy a column block of a 2d array into a contiguous buffer."""
+        for i in range(out.shape[0]):
+            for j in range(out.shape[1]):
+                out[i, j] = flat[i, start + j]
+
+    @numba.njit(cache=True, parallel=True)
+    def _all_copies(flat_bool, n_copies, out):
+        """Reduce consecutive groups of n_copies booleans with logical and."""
+        for i in numba.prange(out.shape[0]):
+            value = True
+            for j in range(n_copies):
+                value = value and flat_bool[i * n_copies + j]
+            out[i] = value
+
 
 class ProductManifold(Manifold):
     """Class for a product of manifolds M_1 x ... x M_n.
@@ -37,12 +63,31 @@ class ProductManifold(Manifold):
     n_jobs : int
         Number of jobs for parallel computing.
         Optional, default: 1.
+    parallel_backend : str
+        Joblib backend used when n_jobs > 1. The default prefers threads,
+        which avoids serializing the per-manifold arrays; pass 'loky' or
+        'multiprocessing' when the per-manifold computations hold the GIL.
+        Optional, default: None.
     """
 
     # FIXME (nguigs): This only works for 1d points
 
+    _DISPATCHED_ARGS = {
+        "belongs": (("point",), ("atol",)),
+        "regularize": (("point",), ()),
+        "projection": (("point",), ()),
+        "to_tangent": (("vector", "base_point"), ()),
+        "is_tangent": (("vector", "base_point"), ("atol",)),
+    }
+
     def __init__(
-        self, manifolds, metrics=None, default_point_type="vector", n_jobs=1, **kwargs
+        self,
+        manifolds,
+        metrics=None,
+        default_point_type="vector",
+        n_jobs=1,
+        parallel_backend=None,
+        **kwargs
     ):
         geomstats.errors.check_parameter_accepted_values(
             default_point_type, "default_point_type", ["vector", "matrix"]
@@ -71,35 +116,209 @@ class ProductManifold(Manifold):
         )
         self.manifolds = manifolds
         self.n_jobs = n_jobs
+        self.parallel_backend = parallel_backend
+        self._slices_intrinsic = self._block_slices(self.dims)
+        self._slices_extrinsic = self._block_slices([k + 1 for k in self.dims])
+        self._homogeneous = all(k == self.dims[0] for k in self.dims)
+        self._uniform_manifolds = all(
+            manifold is manifolds[0] for manifold in manifolds[1:]
+        )
+        self._split_buffers = {}
+        self._bound_methods = {
+            name: [getattr(manifold, name, None) for manifold in manifolds]
+            for name in self._DISPATCHED_ARGS
+        }
+        self._specialized = {
+            name: self._specialize(name)
+            for name, methods in self._bound_methods.items()
+            if all(method is not None for method in methods)
+        }
 
     @staticmethod
     def _get_method(manifold, method_name, metric_args):
         return getattr(manifold, method_name)(**metric_args)
 
-    def _iterate_over_manifolds(self, func, args, intrinsic=False):
+    def _is_intrinsic(self, point):
+        """Test if a point is represented in intrinsic coordinates.
+
+        Same predicate as the product metric's is_intrinsic, but computed
+        from the point's last dimension alone, without going through the
+        metric object.
+        """
+        last_dim = point.shape[-1]
+        if last_dim == self.dim:
+            return True
+        if last_dim == self.dim + len(self.manifolds):
+            return False
+        raise ValueError("Input shape does not match the dimension of the manifold")
+
+    @staticmethod
+    def _all_reduce(results):
+        """Combine per-factor boolean arrays with a running logical and.
+
+        Equivalent to stacking along a last axis and reducing with gs.all,
+        but without materializing the stacked array.
+        """
+        out = results[0]
+        for result in results[1:]:
+            out = gs.logical_and(out, result)
+        return out
 
-        cum_index = (
-            gs.cumsum(self.dims)[:-1]
-            if intrinsic
-            else gs.cumsum([k + 1 for k in self.dims])
+    def _assemble_last_axis(self, results, intrinsic):
+        """Assemble per-factor outputs along the last axis.
+
+        On the numpy backend, each factor's output is written into its slice
+        of a single preallocated array, halving the output memory traffic of
+        a separate concatenation. On backends with immutable tensors, or when
+        the outputs do not line up with the cached slices, fall back to
+        gs.concatenate.
+        """
+        slices = self._slices_intrinsic if intrinsic else self._slices_extrinsic
+        first = results[0]
+        aligned = os.environ["GEOMSTATS_BACKEND"] == "numpy" and all(
+            result.shape[:-1] == first.shape[:-1]
+            and result.dtype == first.dtype
+            and result.shape[-1] == sl.stop - sl.start
+            for sl, result in zip(slices, results)
         )
+        if not aligned:
+            return gs.concatenate(results, axis=-1)
+
+        out = gs.empty((*first.shape[:-1], slices[-1].stop), dtype=first.dtype)
+        for sl, result in zip(slices, results):
+            out[..., sl] = result
+        return out
+
+    @staticmethod
+    def _block_slices(widths):
+        """Compute the slice of the last axis attributed to each factor."""
+        slices, start = [], 0
+        for width in widths:
+            slices.append(slice(start, start + width))
+            start += width
+        return tuple(slices)
+
+    def _split_last_axis(self, key, value, slices, intrinsic):
+        """Split a batch of points along its last axis, one block per factor.
+
+        With the numpy backend and numba installed, each block is copied in a
+        single compiled pass into a contiguous buffer, cached on the instance
+        per argument name and batch shape, so that downstream per-manifold
+        kernels read cache-aligned inputs. Otherwise, zero-copy views are
+        returned; when all factors have equal dimension the last axis is
+        first reshaped to [..., n_manifolds, dim] so that each factor gets a
+        row-contiguous block.
+        """
+        if (
+            numba is None
+            or os.environ["GEOMSTATS_BACKEND"] != "numpy"
+            or value.ndim != 2
+        ):
+            if self._homogeneous:
+                n_blocks = len(slices)
+                block = gs.reshape(
+                    value, (*value.shape[:-1], n_blocks, value.shape[-1] // n_blocks)
+                )
+                return [block[..., i, :] for i in range(n_blocks)]
+            return [value[..., sl] for sl in slices]
+
+        buffers = self._split_buffers.get((key, intrinsic))
+        if (
+            buffers is None
+            or buffers[0].shape[0] != value.shape[0]
+            or buffers[0].dtype != value.dtype
+        ):
+            buffers = [
+                gs.empty((value.shape[0], sl.stop - sl.start), dtype=value.dtype)
+                for sl in slices
+            ]
+            self._split_buffers[(key, intrinsic)] = buffers
+        for sl, buffer in zip(slices, buffers):
+            _copy_block(value, sl.start, buffer)
+        return buffers
+
+    def _specialize(self, func):
+        """Generate a serial dispatcher specialized to this product's factors.
+
+        The factor list is fixed once __init__ returns, so the loop of the
+        generic dispatcher can be partially evaluated: the generated function
+        has the exact slice bounds inlined in its source and the per-factor
+        bound methods as globals, with no per-call dict or list marshaling
+        left.
+        """
+        array_keys, float_keys = self._DISPATCHED_ARGS[func]
+        lines = ["def _specialized(args, intrinsic):"]
+        for key in (*array_keys, *float_keys):
+            lines.append(f"    {key} = args['{key}']")
+
+        def unrolled_calls(slices):
+            calls = []
+            for i, sl in enumerate(slices):
+                kwargs = ", ".join(
+                    [f"{key}={key}[..., {sl.start}:{sl.stop}]" for key in array_keys]
+                    + [f"{key}={key}" for key in float_keys]
+                )
+                calls.append(f"_method_{i}({kwargs})")
+            return "[" + ", ".join(calls) + "]"
+
+        lines.append("    if intrinsic:")
+        lines.append("        return " + unrolled_calls(self._slices_intrinsic))
+        lines.append("    return " + unrolled_calls(self._slices_extrinsic))
+
+        namespace = {
+            f"_method_{i}": method
+            for i, method in enumerate(self._bound_methods[func])
+        }
+        exec("\n".join(lines), namespace)
+        return namespace["_specialized"]
+
+    def _iterate_over_manifolds(self, func, args, intrinsic=False):
+
+        if self.n_jobs == 1:
+            specialized = self._specialized.get(func)
+            if specialized is not None and set(args) == {
+                *self._DISPATCHED_ARGS[func][0],
+                *self._DISPATCHED_ARGS[func][1],
+            }:
+                return specialized(args, intrinsic)
+
+        slices = self._slices_intrinsic if intrinsic else self._slices_extrinsic
         arguments = {}
         float_args = {}
         for key, value in args.items():
             if not isinstance(value, float):
-                arguments[key] = gs.split(value, cum_index, axis=-1)
+                arguments[key] = self._split_last_axis(key, value, slices, intrinsic)
             else:
                 float_args[key] = value
+        manifolds = self.manifolds
+        n_manifolds = len(manifolds)
+        if self.n_jobs == 1:
+            methods = self._bound_methods.get(func)
+            out = []
+            for i in range(n_manifolds):
+                kwargs = {key: arguments[key][i] for key in arguments}
+                kwargs.update(float_args)
+                method = (
+                    methods[i]
+                    if methods and methods[i] is not None
+                    else getattr(manifolds[i], func)
+                )
+                out.append(method(**kwargs))
+            return out
         args_list = [
-            {key: arguments[key][j] for key in arguments}
-            for j in range(len(self.manifolds))
+            {key: arguments[key][j] for key in arguments} for j in range(n_manifolds)
         ]
-        pool = joblib.Parallel(n_jobs=self.n_jobs)
+        pool = joblib.Parallel(
+            n_jobs=self.n_jobs,
+            backend=self.parallel_backend,
+            prefer="threads",
+            batch_size="auto",
+        )
         out = pool(
             joblib.delayed(self._get_method)(
-                self.manifolds[i], func, {**args_list[i], **float_args}
+                manifolds[i], func, {**args_list[i], **float_args}
             )
-            for i in range(len(self.manifolds))
+            for i in range(n_manifolds)
         )
         return out
 
@@ -119,23 +338,28 @@ class ProductManifold(Manifold):
             Boolean evaluating if the point belongs to the manifold.
         """
         if self.default_point_type == "vector":
-            intrinsic = self.metric.is_intrinsic(point)
-            belongs = self._iterate_over_manifolds(
+            intrinsic = self._is_intrinsic(point)
+            each_belongs = self._iterate_over_manifolds(
                 "belongs", {"point": point, "atol": atol}, intrinsic
             )
-            belongs = gs.stack(belongs, axis=-1)
-
-        else:
-            belongs = gs.stack(
-                [
-                    space.belongs(point[..., i, :], atol)
-                    for i, space in enumerate(self.manifolds)
-                ],
-                axis=-1,
+            return self._all_reduce(each_belongs)
+
+        if self._uniform_manifolds:
+            base_manifold = self.manifolds[0]
+            point_ = gs.reshape(point, (-1, *base_manifold.shape))
+            each_belongs = base_manifold.belongs(point_, atol)
+            belongs = gs.reshape(
+                each_belongs,
+                (*point.shape[: -len(base_manifold.shape) - 1], len(self.manifolds)),
             )
+            return gs.all(belongs, axis=-1)
 
-        belongs = gs.all(belongs, axis=-1)
-        return belongs
+        return self._all_reduce(
+            [
+                space.belongs(point[..., i, :], atol)
+                for i, space in enumerate(self.manifolds)
+            ]
+        )
 
     def regularize(self, point):
         """Regularize the point into the manifold's canonical representation.
@@ -154,11 +378,11 @@ class ProductManifold(Manifold):
         point_type = self.default_point_type
 
         if point_type == "vector":
-            intrinsic = self.metric.is_intrinsic(point)
+            intrinsic = self._is_intrinsic(point)
             regularized_point = self._iterate_over_manifolds(
                 "regularize", {"point": point}, intrinsic
             )
-            regularized_point = gs.concatenate(regularized_point, axis=-1)
+            regularized_point = self._assemble_last_axis(regularized_point, intrinsic)
         elif point_type == "matrix":
             regularized_point = [
                 manifold_i.regularize(point[..., i, :])
@@ -184,12 +408,10 @@ class ProductManifold(Manifold):
             Points sampled on the hypersphere.
         """
         if self.default_point_type == "vector":
-            data = self.manifolds[0].random_point(n_samples, bound)
-            if len(self.manifolds) > 1:
-                for space in self.manifolds[1:]:
-                    samples = space.random_point(n_samples, bound)
-                    data = gs.concatenate([data, samples], axis=-1)
-            return data
+            data = [space.random_point(n_samples, bound) for space in self.manifolds]
+            if len(data) == 1:
+                return data[0]
+            return gs.concatenate(data, axis=-1)
 
         point = [space.random_point(n_samples, bound) for space in self.manifolds]
         samples = gs.stack(point, axis=-2)
@@ -211,12 +433,16 @@ class ProductManifold(Manifold):
         point_type = self.default_point_type
 
         if point_type == "vector":
-            intrinsic = self.metric.is_intrinsic(point)
+            intrinsic = self._is_intrinsic(point)
             projected_point = self._iterate_over_manifolds(
                 "projection", {"point": point}, intrinsic
             )
-            projected_point = gs.concatenate(projected_point, axis=-1)
-        elif point_type == "matrix":
+            projected_point = self._assemble_last_axis(projected_point, intrinsic)
+        elif self._uniform_manifolds:
+            base_manifold = self.manifolds[0]
+            point_ = gs.reshape(point, (-1, *base_manifold.shape))
+            projected_point = gs.reshape(base_manifold.projection(point_), point.shape)
+        else:
             projected_point = [
                 manifold_i.projection(point[..., i, :])
                 for i, manifold_i in enumerate(self.manifolds)
@@ -245,12 +471,19 @@ class ProductManifold(Manifold):
         point_type = self.default_point_type
 
         if point_type == "vector":
-            intrinsic = self.metric.is_intrinsic(base_point)
+            intrinsic = self._is_intrinsic(base_point)
             tangent_vec = self._iterate_over_manifolds(
                 "to_tangent", {"base_point": base_point, "vector": vector}, intrinsic
             )
-            tangent_vec = gs.concatenate(tangent_vec, axis=-1)
-        elif point_type == "matrix":
+            tangent_vec = self._assemble_last_axis(tangent_vec, intrinsic)
+        elif self._uniform_manifolds and vector.shape == base_point.shape:
+            base_manifold = self.manifolds[0]
+            vector_ = gs.reshape(vector, (-1, *base_manifold.shape))
+            point_ = gs.reshape(base_point, (-1, *base_manifold.shape))
+            tangent_vec = gs.reshape(
+                base_manifold.to_tangent(vector_, point_), vector.shape
+            )
+        else:
             tangent_vec = [
                 manifold_i.to_tangent(vector[..., i, :], base_point[..., i, :])
                 for i, manifold_i in enumerate(self.manifolds)
@@ -280,27 +513,31 @@ class ProductManifold(Manifold):
             Boolean denoting if vector is a tangent vector at the base point.
         """
         if self.default_point_type == "vector":
-            intrinsic = self.metric.is_intrinsic(base_point)
-            is_tangent = self._iterate_over_manifolds(
+            intrinsic = self._is_intrinsic(base_point)
+            each_tangent = self._iterate_over_manifolds(
                 "is_tangent",
                 {"base_point": base_point, "vector": vector, "atol": atol},
                 intrinsic,
             )
-            is_tangent = gs.stack(is_tangent, axis=-1)
-
-        else:
-            is_tangent = gs.stack(
-                [
-                    space.is_tangent(
-                        vector[..., i, :], base_point[..., i, :], atol=atol
-                    )
-                    for i, space in enumerate(self.manifolds)
-                ],
-                axis=-1,
+            return self._all_reduce(each_tangent)
+
+        if self._uniform_manifolds and vector.shape == base_point.shape:
+            base_manifold = self.manifolds[0]
+            vector_ = gs.reshape(vector, (-1, *base_manifold.shape))
+            point_ = gs.reshape(base_point, (-1, *base_manifold.shape))
+            each_tangent = base_manifold.is_tangent(vector_, point_, atol=atol)
+            is_tangent = gs.reshape(
+                each_tangent,
+                (*vector.shape[: -len(base_manifold.shape) - 1], len(self.manifolds)),
             )
+            return gs.all(is_tangent, axis=-1)
 
-        is_tangent = gs.all(is_tangent, axis=-1)
-        return is_tangent
+        return self._all_reduce(
+            [
+                space.is_tangent(vector[..., i, :], base_point[..., i, :], atol=atol)
+                for i, space in enumerate(self.manifolds)
+            ]
+        )
 
 
 class NFoldManifold(Manifold):
@@ -349,6 +586,38 @@ class NFoldManifold(Manifold):
         if metric is None:
             self.metric = NFoldMetric(base_manifold.metric, n_copies)
 
+    def _n_batch(self, shape):
+        """Compute the flattened batch size of a batch of points.
+
+        Computed in Python from the total element count, so that reshapes
+        get explicit target shapes instead of leaving a -1 for the backend
+        to resolve.
+        """
+        n_batch = 1
+        for dim in shape:
+            n_batch *= dim
+        for dim in self.base_shape:
+            n_batch //= dim
+        return n_batch // self.n_copies
+
+    def _reduce_over_copies(self, each, n_batch):
+        """Reduce per-copy booleans to one boolean per batch element.
+
+        With the numpy backend and numba installed, the reduction is a
+        single fused multi-threaded pass over the flat boolean array;
+        otherwise reshape and reduce with gs.all.
+        """
+        if (
+            numba is not None
+            and os.environ["GEOMSTATS_BACKEND"] == "numpy"
+            and getattr(each, "dtype", None) == bool
+        ):
+            out = gs.empty((n_batch,), dtype=bool)
+            _all_copies(each, self.n_copies, out)
+            return out
+        reshaped = gs.reshape(each, (n_batch, self.n_copies))
+        return gs.all(reshaped, axis=1)
+
     def belongs(self, point, atol=gs.atol):
         """Test if a point belongs to the manifold.
 
@@ -364,10 +633,10 @@ class NFoldManifold(Manifold):
         belongs : array-like, shape=[..., n_copies, *base_shape]
             Boolean evaluating if the point belongs to the manifold.
         """
-        point_ = gs.reshape(point, (-1, *self.base_shape))
+        n_batch = self._n_batch(point.shape)
+        point_ = gs.reshape(point, (n_batch * self.n_copies, *self.base_shape))
         each_belongs = self.base_manifold.belongs(point_, atol=atol)
-        reshaped = gs.reshape(each_belongs, (-1, self.n_copies))
-        return gs.squeeze(gs.all(reshaped, axis=1))
+        return gs.squeeze(self._reduce_over_copies(each_belongs, n_batch))
 
     def is_tangent(self, vector, base_point, atol=gs.atol):
         """Check whether the vector is tangent at base_point.
@@ -390,12 +659,16 @@ class NFoldManifold(Manifold):
         is_tangent : bool
             Boolean denoting if vector is a tangent vector at the base point.
         """
-        vector_, point_ = gs.broadcast_arrays(vector, base_point)
-        point_ = gs.reshape(point_, (-1, *self.base_shape))
-        vector_ = gs.reshape(vector_, (-1, *self.base_shape))
+        if vector.shape == base_point.shape:
+            vector_, point_ = vector, base_point
+        else:
+            vector_, point_ = gs.broadcast_arrays(vector, base_point)
+        n_batch = self._n_batch(vector_.shape)
+        flat_shape = (n_batch * self.n_copies, *self.base_shape)
+        point_ = gs.reshape(point_, flat_shape)
+        vector_ = gs.reshape(vector_, flat_shape)
         each_tangent = self.base_manifold.is_tangent(vector_, point_)
-        reshaped = gs.reshape(each_tangent, (-1, self.n_copies))
-        return gs.all(reshaped, axis=1)
+        return self._reduce_over_copies(each_tangent, n_batch)
 
     def to_tangent(self, vector, base_point):
         """Project a vector to a tangent space of the manifold.
@@ -415,12 +688,19 @@ class NFoldManifold(Manifold):
         tangent_vec : array-like, shape=[..., n_copies, *base_shape]
             Tangent vector at base point.
         """
-        vector_, point_ = gs.broadcast_arrays(vector, base_point)
-        point_ = gs.reshape(point_, (-1, *self.base_shape))
-        vector_ = gs.reshape(vector_, (-1, *self.base_shape))
+        if vector.shape == base_point.shape:
+            vector_, point_ = vector, base_point
+        else:
+            vector_, point_ = gs.broadcast_arrays(vector, base_point)
+        out_shape = vector_.shape
+        flat_shape = (
+            self._n_batch(vector_.shape) * self.n_copies,
+            *self.base_shape,
+        )
+        point_ = gs.reshape(point_, flat_shape)
+        vector_ = gs.reshape(vector_, flat_shape)
         each_tangent = self.base_manifold.to_tangent(vector_, point_)
-        reshaped = gs.reshape(each_tangent, (-1, self.n_copies) + self.base_shape)
-        return gs.squeeze(reshaped)
+        return gs.reshape(each_tangent, out_shape)
 
     def random_point(self, n_samples=1, bound=1.0):
         """Sample in the product space from the uniform distribution.
@@ -439,10 +719,9 @@ class NFoldManifold(Manifold):
             Points sampled on the product manifold.
         """
         sample = self.base_manifold.random_point(n_samples * self.n_copies, bound)
-        reshaped = gs.reshape(sample, (n_samples, self.n_copies) + self.base_shape)
-        if n_samples > 1:
-            return reshaped
-        return gs.squeeze(reshaped, axis=0)
+        if n_samples == 1:
+            return gs.reshape(sample, (self.n_copies,) + self.base_shape)
+        return gs.reshape(sample, (n_samples, self.n_copies) + self.base_shape)
 
     def projection(self, point):
         """Project a point from product embedding manifold to the product manifold.
@@ -458,10 +737,13 @@ class NFoldManifold(Manifold):
             Projected point.
         """
         if hasattr(self.base_manifold, "projection"):
-            point_ = gs.reshape(point, (-1, *self.base_shape))
+            flat_shape = (
+                self._n_batch(point.shape) * self.n_copies,
+                *self.base_shape,
+            )
+            point_ = gs.reshape(point, flat_shape)
             projected = self.base_manifold.projection(point_)
-            reshaped = gs.reshape(projected, (-1, self.n_copies) + self.base_shape)
-            return gs.squeeze(reshaped)
+            return gs.reshape(projected, point.shape)
         raise NotImplementedError(
             "The base manifold does not implement a projection " "method."
         )
@@ -96,6 +96,31 @@ def pytorch_error_msg(a, b, rtol, atol):
     return msg
 
 
+_signature_cache = {}
+_argspec_cache = {}
+
+
+def _cached_signature(func):
+    """Return the signature of func, cached on its code object.
+
+    The copies of a test method made by `copy_func` all share the code
+    object of the original, so the signature is inspected once per test
+    function instead of once per generated copy.
+    """
+    code = func.__code__
+    if code not in _signature_cache:
+        _signature_cache[code] = inspect.signature(func)
+    return _signature_cache[code]
+
+
+def _cached_argspec(func):
+    """Return the full argspec of func, cached on its code object."""
+    code = func.__code__
+    if code not in _argspec_cache:
+        _argspec_cache[code] = inspect.getfullargspec(func)
+    return _argspec_cache[code]
+
+
 def copy_func(f, name=None):
     """Return a function with same code, globals, defaults, closure, and
     name (or provide a new name).
@@ -108,7 +133,10 @@ def copy_func(f, name=None):
     )
     fn.__dict__.update(f.__dict__)
 
-    sign = inspect.signature(fn)
+    sign = _cached_signature(fn)
+    if all(param.default is inspect._empty for param in sign.parameters.values()):
+        return fn, {}
+
     defaults, new_params = {}, []
     for param in sign.parameters.values():
         if param.default is inspect._empty:
@@ -214,7 +242,7 @@ class Parametrizer(type):
                 not skip_all
                 and ("skip_" + attr_name, True) not in locals()["attrs"].items()
             ):
-                arg_names = inspect.getfullargspec(test_func)[0]
+                arg_names = _cached_argspec(test_func)[0]
                 args_str = ", ".join(arg_names[1:])
 
                 test_data = _get_test_data(
@@ -362,14 +390,17 @@ def _handle_tolerances(func_name, arg_names, test_data, cls_tols):
     return test_data
 
 
+_MISSING = object()
+
+
 def _pytestify_test_data(func_name, test_data, arg_names, default_values):
     tests = []
     for test_datum in test_data:
         try:
-            values = [
-                test_datum.get(key) if key in test_datum else default_values[key]
-                for key in arg_names
-            ]
+            values = [test_datum.get(key, _MISSING) for key in arg_names]
+            for index, value in enumerate(values):
+                if value is _MISSING:
+                    values[index] = default_values[arg_names[index]]
 
         except KeyError:
             raise Exception(
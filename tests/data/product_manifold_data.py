@@ -10,6 +10,7 @@ from geomstats.geometry.product_manifold import (
     NFoldMetric,
     ProductManifold,
 )
+from geomstats.geometry.manifold import Manifold
 from geomstats.geometry.product_riemannian_metric import ProductRiemannianMetric
 from geomstats.geometry.special_orthogonal import SpecialOrthogonal
 from tests.data_generation import _ManifoldTestData, _RiemannianMetricTestData
@@ -21,6 +22,29 @@ smoke_manifolds_2 = [Euclidean(3), Minkowski(3)]
 smoke_metrics_2 = [Euclidean(3).metric, Minkowski(3).metric]
 
 
+class _ManifoldWithoutProjection(Manifold):
+    """Minimal manifold implementing only the abstract Manifold interface."""
+
+    def __init__(self, dim=2):
+        super().__init__(dim=dim, shape=(dim,), metric=Euclidean(dim).metric)
+
+    def belongs(self, point, atol=gs.atol):
+        if point.shape[-1] != self.dim:
+            return gs.zeros(point.shape[:-1], dtype=bool)
+        return gs.ones(point.shape[:-1], dtype=bool)
+
+    def is_tangent(self, vector, base_point=None, atol=gs.atol):
+        return self.belongs(vector, atol)
+
+    def to_tangent(self, vector, base_point=None):
+        return vector
+
+    def random_point(self, n_samples=1, bound=1.0):
+        if n_samples == 1:
+            return bound * (gs.random.rand(self.dim) - 0.5)
+        return bound * (gs.random.rand(n_samples, self.dim) - 0.5)
+
+
 class ProductManifoldTestData(_ManifoldTestData):
     n_list = random.sample(range(2, 4), 2)
     default_point_list = ["vector", "matrix"]
@@ -53,6 +77,81 @@ class ProductManifoldTestData(_ManifoldTestData):
         ]
         return self.generate_tests(smoke_data)
 
+    def factor_without_projection_test_data(self):
+        smoke_data = [
+            dict(
+                manifolds=[
+                    _ManifoldWithoutProjection(2),
+                    _ManifoldWithoutProjection(3),
+                ],
+                default_point_type="vector",
+            )
+        ]
+        return self.generate_tests(smoke_data)
+
+    def parallel_matches_serial_test_data(self):
+        smoke_data = [
+            dict(
+                manifolds=smoke_manifolds_1,
+                default_point_type="vector",
+                n_jobs=2,
+                parallel_backend=None,
+            ),
+            dict(
+                manifolds=smoke_manifolds_2,
+                default_point_type="vector",
+                n_jobs=2,
+                parallel_backend="loky",
+            ),
+        ]
+        return self.generate_tests(smoke_data)
+
+    def matrix_point_belongs_test_data(self):
+        sphere = Hypersphere(dim=2)
+        smoke_data = [
+            dict(
+                manifolds=[sphere, sphere],
+                point=gs.stack([sphere.random_point(), sphere.random_point()]),
+                expected=gs.array(True),
+            ),
+            dict(
+                manifolds=[Hypersphere(dim=2), Hypersphere(dim=2)],
+                point=gs.stack([sphere.random_point(), sphere.random_point()]),
+                expected=gs.array(True),
+            ),
+            dict(
+                manifolds=[sphere, sphere],
+                point=gs.stack([sphere.random_point(), sphere.random_point() + 1.0]),
+                expected=gs.array(False),
+            ),
+        ]
+        return self.generate_tests(smoke_data)
+
+    def split_last_axis_matches_views_test_data(self):
+        smoke_data = [
+            dict(
+                manifolds=smoke_manifolds_1,
+                default_point_type="vector",
+                n_points=1,
+            ),
+            dict(
+                manifolds=smoke_manifolds_1,
+                default_point_type="vector",
+                n_points=4,
+            ),
+            dict(
+                manifolds=smoke_manifolds_2,
+                default_point_type="vector",
+                n_points=4,
+            ),
+            dict(
+                manifolds=[Hypersphere(dim=2), Hyperboloid(dim=3)],
+                default_point_type="vector",
+                n_points=4,
+            ),
+        ]
+        return self.generate_tests(smoke_data)
+
     def regularize_test_data(self):
         smoke_data = [
             dict(
@@ -192,6 +291,23 @@ class NFoldManifoldTestData(_ManifoldTestData):
         smoke_data = [dict(base=SpecialOrthogonal(3), power=2, expected=(2, 3, 3))]
         return self.generate_tests(smoke_data)
 
+    def reduce_over_copies_test_data(self):
+        smoke_data = [
+            dict(
+                base=SpecialOrthogonal(3),
+                power=2,
+                each=gs.array([True, True, True, False, False, False]),
+                expected=gs.array([True, False, False]),
+            ),
+            dict(
+                base=SpecialOrthogonal(3),
+                power=3,
+                each=gs.array([True, True, True, True, False, True]),
+                expected=gs.array([True, False]),
+            ),
+        ]
+        return self.generate_tests(smoke_data)
+
 
 class NFoldMetricTestData(_RiemannianMetricTestData):
 
@@ -1,5 +1,7 @@
 """Unit tests for ProductManifold."""
 
+import pytest
+
 import geomstats.backend as gs
 import tests.conftest
 from geomstats.geometry.euclidean import Euclidean
@@ -25,6 +27,53 @@ class TestProductManifold(ManifoldTestCase, metaclass=Parametrizer):
         space = self.Space(manifolds, default_point_type=default_point_type)
         self.assertAllClose(space.dim, expected)
 
+    def test_factor_without_projection(self, manifolds, default_point_type):
+        space = self.Space(manifolds, default_point_type=default_point_type)
+        point = space.random_point(2)
+        self.assertAllEqual(space.belongs(point), gs.array([True, True]))
+        tangent_vec = space.to_tangent(space.random_point(2), point)
+        self.assertAllEqual(
+            space.is_tangent(tangent_vec, point), gs.array([True, True])
+        )
+        self.assertTrue("projection" not in space._specialized)
+        with pytest.raises(AttributeError):
+            space.projection(point)
+
+    def test_parallel_matches_serial(
+        self, manifolds, default_point_type, n_jobs, parallel_backend
+    ):
+        serial_space = self.Space(manifolds, default_point_type=default_point_type)
+        parallel_space = self.Space(
+            manifolds,
+            default_point_type=default_point_type,
+            n_jobs=n_jobs,
+            parallel_backend=parallel_backend,
+        )
+        point = serial_space.random_point(4)
+        vector = serial_space.random_point(4)
+        self.assertAllEqual(parallel_space.belongs(point), serial_space.belongs(point))
+        tangent_vec = serial_space.to_tangent(vector, point)
+        self.assertAllClose(parallel_space.to_tangent(vector, point), tangent_vec)
+        self.assertAllEqual(
+            parallel_space.is_tangent(tangent_vec, point),
+            serial_space.is_tangent(tangent_vec, point),
+        )
+
+    def test_matrix_point_belongs(self, manifolds, point, expected):
+        space = self.Space(manifolds, default_point_type="matrix")
+        self.assertAllEqual(space.belongs(point), expected)
+
+    def test_split_last_axis_matches_views(
+        self, manifolds, default_point_type, n_points
+    ):
+        space = self.Space(manifolds, default_point_type=default_point_type)
+        point = space.random_point(n_points)
+        intrinsic = space._is_intrinsic(point)
+        slices = space._slices_intrinsic if intrinsic else space._slices_extrinsic
+        blocks = space._split_last_axis("point", point, slices, intrinsic)
+        for block, sl in zip(blocks, slices):
+            self.assertAllClose(block, point[..., sl])
+
     def test_regularize(self, manifolds, default_point_type, point):
         space = self.Space(manifolds, default_point_type=default_point_type)
         result = space.regularize(point)
@@ -99,6 +148,15 @@ class TestNFoldManifold(ManifoldTestCase, metaclass=Parametrizer):
         space = self.Space(base, power)
         self.assertAllClose(space.shape, expected)
 
+    def test_reduce_over_copies(self, base, power, each, expected):
+        space = self.Space(base, power)
+        n_batch = len(expected)
+        result = space._reduce_over_copies(each, n_batch)
+        self.assertAllEqual(result, expected)
+        self.assertAllEqual(
+            result, gs.all(gs.reshape(each, (n_batch, power)), axis=1)
+        )
+
 
 class TestNFoldMetric(RiemannianMetricTestCase, metaclass=Parametrizer):
     skip_test_parallel_transport_ivp_is_isometry = True